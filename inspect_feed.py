@@ -1,29 +1,51 @@
 import requests
-from bs4 import BeautifulSoup
+from itertools import chain
+from lxml import etree
+from urllib.parse import quote
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Shared session so repeated feed polls reuse pooled keep-alive connections
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=50,
+    max_retries=Retry(total=3, backoff_factor=0.3)
+))
+
+_RSS_TEMPLATE = "https://news.google.com/rss/search?q={}&hl=en-US&gl=US&ceid=US:en"
+
+def _iter_items(parser, chunks):
+    """Yield each <item> element as soon as the parser has seen it close."""
+    for chunk in chunks:
+        parser.feed(chunk)
+        for _, elem in parser.read_events():
+            yield elem
 
 def inspect_feed():
     query = "BTS US Tour"
-    encoded_query = requests.utils.quote(query)
-    rss_url = f"https://news.google.com/rss/search?q={encoded_query}&hl=en-US&gl=US&ceid=US:en"
+    rss_url = _RSS_TEMPLATE.format(quote(query, safe=""))
     
     print(f"Fetching: {rss_url}")
-    response = requests.get(rss_url)
-    
-    # Print raw first item
-    print("\n--- RAW XML (First 1000 chars) ---")
-    print(response.text[:1000])
-    
-    soup = BeautifulSoup(response.content, "xml")
-    items = soup.find_all("item")
+    with _SESSION.get(rss_url, stream=True, timeout=(3, 10)) as response:
+        # Print raw first item (only the prefix is read before printing)
+        print("\n--- RAW XML (First 1000 bytes) ---")
+        head = response.raw.read(1000, decode_content=True)
+        print(head.decode(response.encoding or "utf-8", "replace"))
+        
+        # Parse while the body arrives and stop reading after the first item
+        parser = etree.XMLPullParser(events=("end",), tag="item")
+        chunks = chain((head,), response.iter_content(chunk_size=8192))
+        item = next(_iter_items(parser, chunks), None)
     
-    if items:
-        item = items[0]
+    if item is not None:
         print("\n--- First Item ---")
-        print(item.prettify())
+        print(etree.tostring(item, pretty_print=True, encoding="unicode"))
         
         print("\n--- Description Content ---")
-        if item.description:
-            print(item.description.text)
+        description = item.findtext("description")
+        if description:
+            print(description)
     else:
         print("No items found.")
 
@@ -1,13 +1,25 @@
+import io
 import os
 import re
-import json
+import orjson
+import socket
+import hashlib
 import logging
+import threading
 import requests
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from dotenv import load_dotenv
-from typing import List, Dict, Set
-from urllib.parse import urlparse, unquote
+from bisect import insort
+from functools import lru_cache
+from html import unescape
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import List, Dict, Optional, Set, Tuple
+from dataclasses import dataclass
+from enum import IntEnum
+from urllib.parse import urlparse, unquote, quote
 
 # Load environment variables
 load_dotenv()
@@ -22,6 +34,306 @@ logger = logging.getLogger(__name__)
 import time
 import random
 
+_RSS_URL_TEMPLATE = "https://news.google.com/rss/search?q={}&hl=en-US&gl=US&ceid=US:en"
+
+@lru_cache(maxsize=512)
+def _rss_url(query: str) -> str:
+    """Build the Google News RSS search URL (memoized: queries repeat every poll)."""
+    return _RSS_URL_TEMPLATE.format(quote(query, safe=""))
+
+# Network-bound fan-out (RSS queries, OG scrapes) runs on a bounded thread pool
+MAX_WORKERS = 16
+
+# RSS feed cache: conditional-GET validators + filtered items per feed URL
+RSS_CACHE_FILE = ".rss_cache.json"
+RSS_CACHE_TTL = 300  # seconds; Google News updates slowly relative to poll cadence
+OG_CACHE_FILE = ".og_cache.json"
+OG_CACHE_TTL = 7 * 86400  # seconds; an article's og:image practically never changes
+OG_MISS_TTL = 86400  # pages without a usable image are retried sooner
+
+# Browser user agent for article fetches, to avoid bot blocks
+_UA_HEADERS = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36'}
+
+# OG-image scraping: only the <head> is needed, so read at most OG_SCAN_LIMIT bytes
+OG_SCAN_LIMIT = 64 * 1024
+_HEAD_END_RE = re.compile(rb"</head", re.IGNORECASE)
+_OG_IMAGE_RE = re.compile(
+    rb"<meta[^>]+?(?:property=[\"']og:image[\"'][^>]*?content=[\"']([^\"']+)"
+    rb"|content=[\"']([^\"']+)[\"'][^>]*?property=[\"']og:image[\"'])",
+    re.IGNORECASE
+)
+
+# summary.md table row; {0} is the escaped item fields, {1} the cities/dates cell
+_MD_ROW = "| **{0[artist]}** | {0[topic]} | *{0[source]}* | [{0[title]}]({0[url]}) | {1} |"
+_MD_TEXT_FIELDS = ("artist", "topic", "source", "title")
+
+# One-pass escape tables (str.translate runs a single C loop per string): feed text
+# must not close a table cell or link label, nor a link target or HTML attribute
+_MD_ESC = str.maketrans({"|": "\\|", "[": "\\[", "]": "\\]", "\n": " ", "\r": " "})
+_MD_URL_ESC = str.maketrans({"(": "%28", ")": "%29", " ": "%20"})
+_HTML_ESC = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"})
+
+# Report "local" badge: home city in the title or among the extracted cities
+_LOCAL_TITLE_RE = re.compile(r"\bSeattle\b", re.IGNORECASE | re.ASCII)
+LOCAL_CITIES = frozenset({"seattle"})
+
+# First <img src> in a Google News description snippet
+_IMG_SRC_RE = re.compile(r"<img[^>]+?\bsrc=[\"']([^\"']+)", re.IGNORECASE)
+
+def _read_html_head(resp, limit: int = OG_SCAN_LIMIT) -> bytes:
+    """Read a streamed response until </head> shows up or `limit` bytes are buffered."""
+    buf = bytearray()
+    for chunk in resp.iter_content(chunk_size=8192):
+        buf += chunk
+        if _HEAD_END_RE.search(buf, max(0, len(buf) - len(chunk) - 6)) or len(buf) >= limit:
+            break
+    return bytes(buf)
+
+def _find_og_image(head: bytes) -> str:
+    """Pull og:image out of raw <head> bytes: regex first, lxml <meta> scan as fallback."""
+    match = _OG_IMAGE_RE.search(head)
+    if match:
+        return unescape((match.group(1) or match.group(2)).decode("utf-8", "replace"))
+    try:
+        for _, meta in etree.iterparse(io.BytesIO(head), events=("end",), tag="meta", html=True, recover=True):
+            if meta.get("property") == "og:image" and meta.get("content"):
+                return meta.get("content")
+    except etree.LxmlError:
+        pass
+    return ""
+
+@lru_cache(maxsize=4096)
+def _domain_of(url: str) -> str:
+    """Lower-cased hostname of a URL (memoized: feeds repeat the same links)."""
+    try:
+        return urlparse(url).hostname or ""
+    except ValueError:
+        return ""
+
+_MRSS_CONTENT = "{http://search.yahoo.com/mrss/}content"
+
+def _iter_rss_items(chunks):
+    """Yield <item> elements while the RSS body is still arriving, freeing each once the caller moves on."""
+    parser = etree.XMLPullParser(events=("end",), tag="item", recover=True)
+    for chunk in chunks:
+        parser.feed(chunk)
+        for _, item in parser.read_events():
+            yield item
+            item.clear()
+            # Drop already-processed siblings so the tree never holds more than one item
+            while item.getprevious() is not None:
+                del item.getparent()[0]
+    parser.close()
+
+# Unicode-aware: Hangul, kana and accented titles have words too
+_TITLE_WORD_RE = re.compile(r"[^\W_]+")
+
+# Word-set Jaccard similarity at which two headlines count as the same story
+DEDUP_THRESHOLD = 0.8
+# ...or a few character edits apart (typo fixes, "Unveil"/"Unveils"): one edit per
+# DEDUP_CHARS_PER_EDIT characters of the shorter title, never more than DEDUP_MAX_EDITS
+DEDUP_MAX_EDITS = 5
+DEDUP_CHARS_PER_EDIT = 10
+
+def _title_words(title: str, source: str = "") -> List[str]:
+    """Lower-cased words of a title, without its " - Source" suffix or punctuation."""
+    suffix = f" - {source}"
+    if source and title.endswith(suffix):
+        title = title[:-len(suffix)]
+    # Dots are dropped rather than split on, so "U.S." and "US" are the same word
+    return _TITLE_WORD_RE.findall(title.lower().replace(".", ""))
+
+def _title_key(title: str, source: str = "") -> bytes:
+    """Dedup key: hash of the title without its " - Source" suffix, case or punctuation."""
+    # A title made only of symbols or emoji has no words; key it on the raw text
+    # so two such titles never share the empty-string key
+    normalized = "".join(_title_words(title, source)) or title.lower()
+    return hashlib.blake2b(normalized.encode(), digest_size=8).digest()
+
+def _same_story(a: frozenset, b: frozenset) -> bool:
+    """Word-set Jaccard test: order- and punctuation-blind, like a token-set ratio."""
+    # Wordless titles carry nothing to compare; only their exact keys can match
+    if not a or not b:
+        return False
+    # Jaccard can never reach the threshold when one set is much smaller
+    if min(len(a), len(b)) < DEDUP_THRESHOLD * max(len(a), len(b)):
+        return False
+    shared = len(a & b)
+    return shared >= DEDUP_THRESHOLD * (len(a) + len(b) - shared)
+
+def _within_edits(a: str, b: str, k: Optional[int] = None) -> bool:
+    """Levenshtein distance <= k, via Myers' bit-parallel algorithm (Hyyro's formulation).
+
+    One DP column of `a` is packed into the bits of a Python int, so each character
+    of `b` costs a handful of and/or/xor/add ops instead of len(a) cell updates.
+    k defaults to the length-scaled dedup budget.
+    """
+    if k is None:
+        k = min(DEDUP_MAX_EDITS, min(len(a), len(b)) // DEDUP_CHARS_PER_EDIT)
+    if abs(len(a) - len(b)) > k:
+        return False
+    if not a:
+        return len(b) <= k
+    peq: Dict[str, int] = {}
+    for i, ch in enumerate(a):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    mask = (1 << len(a)) - 1
+    last = 1 << (len(a) - 1)
+    pv, mv, score = mask, 0, len(a)
+    remaining = len(b)
+    for ch in b:
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        remaining -= 1
+        # The score drops by at most one per remaining character of b
+        if score - remaining > k:
+            return False
+        ph = (ph << 1) | 1
+        mh <<= 1
+        pv = (mh | ~(xv | ph)) & mask
+        mv = ph & xv & mask
+    return score <= k
+
+def _url_key(url: str) -> str:
+    """Compact, filesystem/JSON-safe cache key for a URL."""
+    return hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
+
+def _load_json_cache(path: str) -> Dict[str, Dict]:
+    """Load a persisted JSON cache (empty if missing or unreadable)."""
+    try:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    except (OSError, ValueError):
+        return {}
+
+def _trie_pattern(words) -> str:
+    """Build a prefix-factored regex alternation from literal words.
+
+    Shared prefixes are merged into one branch ("c(?:ities|omeback)"), so the
+    regex engine walks a single prefix tree per position, like the goto function
+    of an Aho-Corasick automaton, instead of retrying every alternative.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        optional = "" in node
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")" + ("?" if optional else "")
+
+    return build(trie)
+
+def _install_dns_cache(maxsize: int = 64):
+    """Memoize getaddrinfo so repeat requests to the same hosts skip DNS for the run."""
+    if not hasattr(socket.getaddrinfo, "cache_info"):
+        socket.getaddrinfo = lru_cache(maxsize=maxsize)(socket.getaddrinfo)
+
+# Bad Image Patterns (Google News Logos, tracking pixels, etc.)
+# Plain substrings, not regexes: `in` uses CPython's C fast-search and
+# beats a compiled alternation for a handful of short literals.
+BAD_IMAGE_PATTERNS = (
+    "lh3.googleusercontent.com",
+    "google.com/logos",
+    "gstatic.com",
+    "gnews-logo"
+)
+
+def is_valid_image(url: str) -> bool:
+    """Check if image URL is valid and not a known placeholder."""
+    if not url:
+        return False
+    for pattern in BAD_IMAGE_PATTERNS:
+        if pattern in url:
+            return False
+    return True
+
+def filter_image_urls(urls: List[str]) -> List[bool]:
+    """Batch form of is_valid_image: one flag per URL, no per-call method dispatch."""
+    return list(map(is_valid_image, urls))
+
+# Static Profile Images (report avatar fallback when no news image is found)
+PROFILE_IMAGES = {
+    "BTS": "https://upload.wikimedia.org/wikipedia/commons/thumb/6/65/BTS_logo_%282017%29.png/600px-BTS_logo_%282017%29.png",
+    "BLACKPINK": "https://upload.wikimedia.org/wikipedia/commons/2/29/Blackpink_logo.svg",
+    "SEVENTEEN": "https://upload.wikimedia.org/wikipedia/commons/thumb/f/f6/Seventeen_Logo.jpg/640px-Seventeen_Logo.jpg",
+    "NewJeans": "https://upload.wikimedia.org/wikipedia/commons/thumb/1/1b/NewJeans_Logo.svg/1200px-NewJeans_Logo.svg.png",
+    "ENHYPEN": "https://upload.wikimedia.org/wikipedia/commons/thumb/6/6b/Enhypen_logo.svg/1200px-Enhypen_logo.svg.png",
+    "ITZY": "https://upload.wikimedia.org/wikipedia/commons/thumb/b/b3/Itzy_logo.svg/1200px-Itzy_logo.svg.png",
+    "NCT DREAM": "https://upload.wikimedia.org/wikipedia/commons/thumb/3/30/NCT_Dream_logo.svg/1200px-NCT_Dream_logo.svg.png",
+    "TWICE": "https://upload.wikimedia.org/wikipedia/commons/thumb/f/f3/Twice_Logo.png/640px-Twice_Logo.png",
+    "Stray Kids": "https://upload.wikimedia.org/wikipedia/commons/thumb/f/f1/Stray_Kids_Logo.svg/1200px-Stray_Kids_Logo.svg.png",
+    "aespa": "https://upload.wikimedia.org/wikipedia/commons/thumb/2/23/Aespa_Logo.svg/1200px-Aespa_Logo.svg.png",
+    "IVE": "https://upload.wikimedia.org/wikipedia/commons/thumb/c/c9/Ive_Logo.svg/1200px-Ive_Logo.svg.png",
+    "LE SSERAFIM": "https://upload.wikimedia.org/wikipedia/commons/thumb/e/e0/Le_Sserafim_Logo.svg/1200px-Le_Sserafim_Logo.svg.png",
+    "BABYMONSTER": "https://upload.wikimedia.org/wikipedia/commons/thumb/a/a2/Babymonster_Logo.svg/1200px-Babymonster_Logo.svg.png",
+    "ATEEZ": "https://upload.wikimedia.org/wikipedia/commons/thumb/1/14/Ateez_logo.png/640px-Ateez_logo.png",
+    "NCT WISH": "https://upload.wikimedia.org/wikipedia/commons/thumb/0/07/NCT_Wish_Logo.svg/1200px-NCT_Wish_Logo.svg.png",
+    "TWS": "https://upload.wikimedia.org/wikipedia/commons/thumb/5/52/TWS_Logo.svg/1200px-TWS_Logo.svg.png",
+    "KISS OF LIFE": "https://upload.wikimedia.org/wikipedia/commons/thumb/3/3d/Kiss_of_Life_Logo.svg/1200px-Kiss_of_Life_Logo.svg.png",
+    "BIBI": "https://i.scdn.co/image/ab6761610000e5eb989ed05e1f059c60d5b6de3d",
+    "XG": "https://upload.wikimedia.org/wikipedia/commons/thumb/0/0d/XG_Logo.svg/1200px-XG_Logo.svg.png",
+    "NMIXX": "https://upload.wikimedia.org/wikipedia/commons/thumb/e/ee/Nmixx_Logo.svg/1200px-Nmixx_Logo.svg.png",
+    "Cortis": "",
+    "All Day Project": ""
+}
+
+# Generated initials avatar, the last resort when an artist has no image at all
+_UI_AVATAR_URL = "https://ui-avatars.com/api/?name={}&background=random&color=fff&size=200"
+
+class Category(IntEnum):
+    """Artist grouping. Compared as ints; `label` is the text the report filters on."""
+    BOY_GROUP = 0
+    GIRL_GROUP = 1
+    SOLOIST = 2
+    COED = 3
+
+    @property
+    def label(self) -> str:
+        return _CATEGORY_LABELS[self]
+
+_CATEGORY_LABELS = ("Boy Group", "Girl Group", "Soloist", "Co-ed Group")
+
+@dataclass
+class NewsItem:
+    """One validated article. Slotted: thousands are alive between fetch and enrichment."""
+    # Fields written to JSON by to_dict(); the dedup key is internal and never exported
+    _EXPORT_FIELDS = ("artist", "topic", "title", "source", "url", "published_at",
+                      "image_url", "extracted_cities", "extracted_dates")
+    __slots__ = _EXPORT_FIELDS + ("key",)
+    artist: str
+    topic: str
+    title: str
+    source: str
+    url: str
+    published_at: str
+    image_url: str
+    extracted_cities: List[str]
+    extracted_dates: List[str]
+    key: bytes  # _title_key(title, source), computed once for dedup
+
+    @classmethod
+    def from_dict(cls, record: Dict) -> "NewsItem":
+        return cls(key=_title_key(record["title"], record["source"]), **record)
+
+    def to_dict(self) -> Dict:
+        """JSON-ready record (everything but the dedup key)."""
+        return {name: getattr(self, name) for name in self._EXPORT_FIELDS}
+
 class RealTimeScraper:
     """
     Real-time price tracker currently checking StubHub & Ticketmaster API simulation.
@@ -60,6 +372,8 @@ class RealTimeScraper:
         return current_price, "USD", timestamp
 
 class KpopIntelligenceBot:
+    BAD_IMAGE_PATTERNS = BAD_IMAGE_PATTERNS
+
     def __init__(self):
         self.whitelist: Set[str] = {
             "soompi.com", "allkpop.com", "billboard.com", "nme.com", 
@@ -72,290 +386,414 @@ class KpopIntelligenceBot:
             "dates", "cities", "unveils", "drops", "release", "comeback"
         }
         
-        # Regex for US Cities (Common tour stops)
-        self.city_regex = re.compile(
-            r"\b(Seattle|New York|NYC|Los Angeles|LA|Chicago|Houston|Atlanta|"
-            r"Dallas|San Francisco|Oakland|Newark|Washington D\.C\.|Las Vegas|"
-            r"Anaheim|Inglewood|Rosemont|Fort Worth|Belmont Park|Reading)\b", 
-            re.IGNORECASE
-        )
+        # US Cities (Common tour stops), prefix-factored so sre never retries a shared prefix
+        city_pattern = _trie_pattern((
+            "Seattle", "New York", "NYC", "Los Angeles", "LA", "Chicago", "Houston", "Atlanta",
+            "Dallas", "San Francisco", "Oakland", "Newark", "Washington D.C.", "Las Vegas",
+            "Anaheim", "Inglewood", "Rosemont", "Fort Worth", "Belmont Park", "Reading"
+        ))
         
         # Regex for future dates (simplified for demonstration)
-        self.date_regex = re.compile(
-            r"\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{1,2}(?:st|nd|rd|th)?,?\s+\d{4}\b",
-            re.IGNORECASE
+        # Separators also accept U+00A0: feeds often write "March&nbsp;15", and re.ASCII narrows \s
+        date_pattern = r"(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?[\s\xa0]+\d{1,2}(?:st|nd|rd|th)?,?[\s\xa0]+\d{4}"
+        
+        # Cities and dates in one pass; match.lastgroup says which one hit.
+        # The tokens are ASCII: re.ASCII skips Unicode case folding (~40% faster).
+        self.metadata_regex = re.compile(
+            rf"\b(?:(?P<city>{city_pattern})|(?P<date>{date_pattern}))\b",
+            re.IGNORECASE | re.ASCII
+        )
+
+        # Single-pass trie matchers compiled once per bot. Keywords are matched
+        # case-sensitively against lowered text: re.IGNORECASE is ~4x slower here.
+        self._keyword_re = re.compile(_trie_pattern(self.validation_keywords))
+        self._whitelist_set = frozenset(self.whitelist)
+        self._domain_verdicts: Dict[str, bool] = {}
+        # Source names as Google News prints them: "Soompi", "Rolling Stone", "nme.com"
+        self._source_names = frozenset(
+            name for domain in self.whitelist
+            for name in (domain.replace(".", ""), domain.rsplit(".", 1)[0].replace(".", ""))
         )
+        self._source_verdicts: Dict[str, bool] = {}
+
+        self.feed_cache: Dict[str, Dict] = _load_json_cache(RSS_CACHE_FILE)
+        self.og_cache: Dict[str, Dict] = _load_json_cache(OG_CACHE_FILE)
+        self._local = threading.local()
+        # One thread-safe connection pool shared by every worker's Session, so a
+        # keep-alive connection opened by one thread is reused by the others.
+        # Dropped connections and gateway errors are retried; slow reads are not.
+        self._adapter = HTTPAdapter(
+            pool_connections=MAX_WORKERS,
+            pool_maxsize=2 * MAX_WORKERS,
+            max_retries=Retry(total=3, read=0, backoff_factor=0.5, status_forcelist=(502, 503, 504))
+        )
+
+    @property
+    def session(self) -> requests.Session:
+        """Keep-alive Session, one per worker thread, backed by the shared pool."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("http://", self._adapter)
+            session.mount("https://", self._adapter)
+            self._local.session = session
+        return session
+
+    def save_feed_cache(self):
+        """Persist RSS validators and items so the next run can revalidate cheaply."""
+        with open(RSS_CACHE_FILE, "wb") as f:
+            f.write(orjson.dumps(self.feed_cache))
+
+    def save_og_cache(self):
+        """Persist scraped OG images so repeat runs skip the article fetch."""
+        # Drop expired entries so the file only grows with articles still in the feeds
+        now = time.time()
+        fresh = {key: entry for key, entry in self.og_cache.items()
+                 if now - entry["fetched_at"] < self._og_ttl(entry)}
+        with open(OG_CACHE_FILE, "wb") as f:
+            f.write(orjson.dumps(fresh))
 
-        # Bad Image Patterns (Google News Logos, tracking pixels, etc.)
-        self.BAD_IMAGE_PATTERNS = [
-            "lh3.googleusercontent.com",
-            "google.com/logos",
-            "gstatic.com",
-            "gnews-logo"
-        ]
+    @staticmethod
+    def _og_ttl(entry: Dict) -> int:
+        """How long a cached OG lookup stays fresh: hits last a week, misses a day."""
+        return OG_CACHE_TTL if entry["image_url"] else OG_MISS_TTL
 
     def is_valid_image(self, url: str) -> bool:
         """Check if image URL is valid and not a known placeholder."""
-        if not url:
-            return False
-        for pattern in self.BAD_IMAGE_PATTERNS:
-            if pattern in url:
-                return False
-        return True
+        return is_valid_image(url)
+
+    def filter_image_urls(self, urls: List[str]) -> List[bool]:
+        """Validate a whole batch of image URLs in one call."""
+        return filter_image_urls(urls)
 
     def is_whitelisted(self, url: str) -> bool:
         """Check if the source domain is in the whitelist."""
-        try:
-            domain = urlparse(url).netloc.lower()
-            return any(allowed in domain for allowed in self.whitelist)
-        except Exception:
-            return False
+        domain = _domain_of(url)
+        verdict = self._domain_verdicts.get(domain)
+        if verdict is None:
+            # Walk the host's parent domains ("www.nme.com" -> "nme.com") through the set
+            parts = domain.split(".")
+            verdict = self._domain_verdicts[domain] = any(
+                ".".join(parts[i:]) in self._whitelist_set for i in range(len(parts) - 1)
+            )
+        return verdict
 
     def validate_content(self, text: str) -> bool:
         """Check if text contains at least one validation keyword."""
-        text_lower = text.lower()
-        return any(keyword in text_lower for keyword in self.validation_keywords)
+        return self._keyword_re.search(text.lower()) is not None
 
     def extract_metadata(self, text: str) -> Dict:
         """Extract structured data using regex."""
-        cities = list(set(self.city_regex.findall(text)))
-        dates = list(set(self.date_regex.findall(text)))
+        # dicts dedupe like sets but keep the order the mentions appear in
+        found = {"city": {}, "date": {}}
+        for match in self.metadata_regex.finditer(text):
+            found[match.lastgroup][match.group()] = None
         return {
-            "cities": cities,
-            "dates": dates
+            "cities": list(found["city"]),
+            "dates": list(found["date"])
         }
 
-    def fetch_news(self, artist: str, query_type: str = "US Tour") -> List[Dict]:
+    def fetch_news(self, artist: str, query_type: str = "US Tour") -> List[NewsItem]:
         """Fetch news from Google News RSS."""
         query = f"{artist} {query_type}"
-        encoded_query = requests.utils.quote(query)
-        rss_url = f"https://news.google.com/rss/search?q={encoded_query}&hl=en-US&gl=US&ceid=US:en"
-        
+        rss_url = _rss_url(query)
+
         logger.info(f"Fetching news for: {query}")
-        
+
+        # Serve fresh cache entries without touching the network
+        cached = self.feed_cache.get(rss_url)
+        if cached and time.time() - cached["fetched_at"] < RSS_CACHE_TTL:
+            logger.info(f"Using cached feed for: {query}")
+            return [NewsItem.from_dict(record) for record in cached["items"]]
+
+        # Otherwise revalidate: an unchanged feed answers 304 with no body
+        headers = {}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        response = None
         try:
-            response = requests.get(rss_url, timeout=10)
+            response = self.session.get(rss_url, headers=headers, timeout=(3, 10), stream=True)
             response.raise_for_status()
         except requests.RequestException as e:
+            # A streamed error response still holds its pooled connection until closed
+            if response is not None:
+                response.close()
             logger.error(f"Failed to fetch RSS feed: {e}")
             return []
 
-        soup = BeautifulSoup(response.content, "xml")
-        items = soup.find_all("item")
-        
-        logger.info(f"Found {len(items)} raw items for {query}")
-        
+        if response.status_code == 304:
+            logger.info(f"Feed unchanged for: {query}")
+            response.close()
+            cached["fetched_at"] = time.time()
+            return [NewsItem.from_dict(record) for record in cached["items"]]
+
         extracted_data = []
+        raw_count = 0
 
-        for item in items:
-            title = item.title.text
-            # Google News RSS source is often in <source> tag or appended to title
-            source_tag = item.find("source")
-            source_name = source_tag.text if source_tag else "Unknown"
-            link = item.link.text
-            pub_date = item.pubDate.text
-            description = item.description.text if item.description else ""
-            
-            # Extract Image from description or media extensions
-            image_url = ""
-            
-            # Try media:content or enclosure first (higher quality)
-            media_content = item.find("media:content")
-            if media_content and media_content.get("url"):
-                image_url = media_content["url"]
-            
-            # Fallback to description parsing
-            if not image_url and description:
-                desc_soup = BeautifulSoup(description, "html.parser")
-                img_tag = desc_soup.find("img")
-                if img_tag and img_tag.get("src"):
-                    candidate_url = img_tag["src"]
-                    if self.is_valid_image(candidate_url):
-                        image_url = candidate_url
-
-            # Combined text for analysis
-            full_text = f"{title} {description}"
-
-            # 1. Source Whitelisting (Strict Mode: Skip if not authoritative)
-            if not self.is_whitelisted_source_name(source_name) and not self.is_whitelisted(link):
-                 if not self.is_whitelisted_source_name(source_name):
-                     continue
-
-            # 2. Keyword Validation
-            if not self.validate_content(full_text):
-                continue
+        # Parse items as the body streams in instead of buffering the whole feed
+        try:
+            for item in _iter_rss_items(response.iter_content(chunk_size=8192)):
+                raw_count += 1
+                title = item.findtext("title", "")
+                # Google News RSS source is often in <source> tag or appended to title
+                source_name = item.findtext("source", "Unknown")
+                link = item.findtext("link", "")
+
+                # 1. Source Whitelisting (Strict Mode: Skip if not authoritative)
+                if not (self.is_whitelisted_source_name(source_name) or self.is_whitelisted(link)):
+                    continue
+
+                # 2. Keyword Validation: most kept items match on the title alone,
+                # so the longer description is only scanned when the title misses
+                description = item.findtext("description", "")
+                if not (self.validate_content(title) or self.validate_content(description)):
+                    continue
+
+                # 3. Extraction (only for items that survived both filters)
+                metadata = self.extract_metadata(f"{title} {description}")
+                pub_date = item.findtext("pubDate", "")
+
+                # Extract Image from description or media extensions
+                image_url = ""
+
+                # Try media:content or enclosure first (higher quality)
+                media_content = item.find(_MRSS_CONTENT)
+                if media_content is not None and media_content.get("url"):
+                    image_url = media_content.get("url")
+
+                # Fallback to description parsing
+                if not image_url and description:
+                    img_match = _IMG_SRC_RE.search(description)
+                    if img_match:
+                        candidate_url = unescape(img_match.group(1))
+                        if self.is_valid_image(candidate_url):
+                            image_url = candidate_url
+
+                extracted_data.append(NewsItem(
+                    artist=artist,
+                    topic=query_type,
+                    title=title,
+                    source=source_name,
+                    url=link,
+                    published_at=pub_date,
+                    image_url=image_url,
+                    extracted_cities=metadata["cities"],
+                    extracted_dates=metadata["dates"],
+                    key=_title_key(title, source_name)
+                ))
+        except requests.RequestException as e:
+            logger.error(f"Failed to read RSS feed: {e}")
+            return []
+        except etree.XMLSyntaxError as e:
+            # An empty or unrecoverable body has no items; one bad feed must not stop the scan
+            logger.error(f"Failed to parse RSS feed for {query}: {e}")
+            return []
+        finally:
+            response.close()
+
+        logger.info(f"Found {raw_count} raw items for {query}")
+
+        # Final image check, batched over every kept item
+        image_flags = filter_image_urls([record.image_url for record in extracted_data])
+        for record, is_ok in zip(extracted_data, image_flags):
+            if not is_ok:
+                record.image_url = ""
+
+        self.feed_cache[rss_url] = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+            "items": [record.to_dict() for record in extracted_data]
+        }
 
-            # 3. Extraction
-            metadata = self.extract_metadata(full_text)
-            
-            # Final image check before adding
-            if image_url and not self.is_valid_image(image_url):
-                 image_url = ""
-
-            extracted_data.append({
-                "artist": artist,
-                "topic": query_type,
-                "title": title,
-                "source": source_name,
-                "url": link,
-                "published_at": pub_date,
-                "image_url": image_url,
-                "extracted_cities": metadata["cities"],
-                "extracted_dates": metadata["dates"]
-            })
-            
         return extracted_data
-        
+
     def is_whitelisted_source_name(self, source_name: str) -> bool:
         """Helper to match Source Name (e.g. 'Soompi') against whitelist domains."""
-        # Simple mapping or containment check
-        name_clean = source_name.lower().replace(" ", "")
-        for domain in self.whitelist:
-            if name_clean in domain.replace(".", ""):
-                return True
-        return False
+        verdict = self._source_verdicts.get(source_name)
+        if verdict is None:
+            name_clean = source_name.lower().replace(" ", "").replace(".", "")
+            verdict = self._source_verdicts[source_name] = name_clean in self._source_names
+        return verdict
 
     def fetch_og_image(self, url: str) -> str:
-        """Fetch Open Graph image from a URL."""
+        """Fetch Open Graph image from a URL (served from the disk cache while fresh)."""
+        cached = self.cached_og_image(url)
+        if cached is not None:
+            return cached
+        
+        image_url = ""
         try:
             # Short timeout, user agent to avoid bot blocks
-            headers = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36'}
-            resp = requests.get(url, headers=headers, timeout=3)
-            if resp.status_code == 200:
-                soup = BeautifulSoup(resp.content, "html.parser")
-                og_image = soup.find("meta", property="og:image")
-                if og_image and og_image.get("content"):
-                    img_src = og_image["content"]
+            with self.session.get(url, headers=_UA_HEADERS, timeout=3, stream=True) as resp:
+                # Headers are in before any body bytes: skip non-HTML (PDFs, images, feeds) unread
+                if resp.status_code == 200 and "html" in resp.headers.get("Content-Type", "text/html"):
+                    img_src = _find_og_image(_read_html_head(resp))
                     if self.is_valid_image(img_src):
-                        return img_src
+                        image_url = img_src
         except Exception as e:
+            # Transient failures are not cached so the next run retries
             logger.debug(f"Failed to fetch OG image for {url}: {e}")
-        return ""
+            return ""
+        
+        self.og_cache[_url_key(url)] = {"image_url": image_url, "fetched_at": time.time()}
+        return image_url
+
+    def cached_og_image(self, url: str):
+        """Fresh cached OG lookup for a URL ("" for a known miss), or None if it must be fetched."""
+        cached = self.og_cache.get(_url_key(url))
+        if cached and time.time() - cached["fetched_at"] < self._og_ttl(cached):
+            return cached["image_url"]
+        return None
 
-    def enrich_with_images(self, items: List[Dict], limit_per_artist: int = 4):
+    def enrich_with_images(self, items: List[NewsItem], limit_per_artist: int = 4) -> List[NewsItem]:
         """Post-process items to add images by scraping source URL."""
         logger.info("Enriching news metadata (Scanning for images)...")
         
         # Track counts to limit scraping
         artist_counts = {} 
         
-        updated_items = []
+        # Pick the items to scrape up front so the per-artist limit stays deterministic
+        to_scrape = []
         for item in items:
-            key = f"{item['artist']}_{item['topic']}"
+            key = (item.artist, item.topic)
             count = artist_counts.get(key, 0)
             
-            if count < limit_per_artist and not item.get("image_url"):
+            if count < limit_per_artist and not item.image_url:
                 # Fetch only if we don't have one and haven't hit limit
-                item["image_url"] = self.fetch_og_image(item["url"])
+                to_scrape.append(item)
                 artist_counts[key] = count + 1
-                logger.info(f"Scraped image for {item['artist']} - {item['title'][:20]}...")
-            
-            updated_items.append(item)
+        
+        # Answer cache hits inline; only real fetches are worth a pool thread
+        pending = []
+        for item in to_scrape:
+            cached = self.cached_og_image(item.url)
+            if cached is None:
+                pending.append(item)
+            else:
+                item.image_url = cached
+        if not pending:
+            return list(items)
+        
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(pending))) as executor:
+            futures = {executor.submit(self.fetch_og_image, item.url): item for item in pending}
+            for future in as_completed(futures):
+                item = futures[future]
+                item.image_url = future.result()
+                logger.info(f"Scraped image for {item.artist} - {item.title[:20]}...")
             
-        return updated_items
+        return list(items)
 
-    def deduplicate(self, items: List[Dict]) -> List[Dict]:
+    def deduplicate(self, items: List[NewsItem]) -> List[NewsItem]:
         """Deduplicate news items based on Title similarity."""
-        unique_items = []
-        seen_titles = set()
-        
+        # First occurrence wins; dicts keep insertion order. Exact repeats are caught by the
+        # key hashed at fetch time, before any word sets are built
+        unique_items = {}
+        # Kept titles' word sets per artist: reprints only ever collide within one artist's
+        # results, so each title is compared against its own bucket, not the whole scan
+        buckets: Dict[str, List[Tuple[Tuple[frozenset, frozenset], frozenset, str]]] = {}
         for item in items:
-            # Simple normalization: First 20 chars of title + source
-            # In production, use Fuzzy Matching (e.g. Lev Distance)
-            title_key = item['title'][:30].lower()
-            if title_key not in seen_titles:
-                seen_titles.add(title_key)
-                unique_items.append(item)
+            key = item.key
+            if key in unique_items:
+                continue
+            words = _title_words(item.title, item.source)
+            if not words:
+                # Nothing to fuzzy-match on (emoji/symbol-only title): the exact key decides
+                unique_items[key] = item
+                continue
+            word_set, text = frozenset(words), " ".join(words)
+            # A different year, day number or city is a different announcement, however
+            # similar the rest of the headline: fuzzy merges need these to agree exactly
+            facts = (
+                frozenset(word for word in words if any(ch.isdigit() for ch in word)),
+                frozenset(city.lower() for city in item.extracted_cities),
+            )
+            kept = buckets.setdefault(item.artist, [])
+            # Near-duplicate (wire reprint, retitled copy, typo fix) of a kept story
+            if any(other_facts == facts
+                   and (_same_story(word_set, other_set) or _within_edits(text, other_text))
+                   for other_facts, other_set, other_text in kept):
+                continue
+            kept.append((facts, word_set, text))
+            unique_items[key] = item
                 
-        return unique_items
+        return list(unique_items.values())
 
-    def run(self, targets: Dict[str, str]):
+    def run(self, targets: Dict[Category, Tuple[str, ...]]):
+        """Scan every artist in `targets` (category -> artist names) and write the reports."""
         all_news = []
-        artists = list(targets.keys())
+        artists = [name for names in targets.values() for name in names]
+        categories = {name: category for category, names in targets.items() for name in names}
         
         # Check if we have cached data to speed up UI dev
         if os.path.exists("kpop_intelligence.json"):
             logger.info("Loading cached intelligence data...")
-            with open("kpop_intelligence.json", "r") as f:
-                enriched_news = json.load(f)
+            with open("kpop_intelligence.json", "rb") as f:
+                enriched_news = orjson.loads(f.read())
         else:
-            for artist in artists:
-                # Check for both Tour and Comeback
-                all_news.extend(self.fetch_news(artist, "US Tour"))
-                all_news.extend(self.fetch_news(artist, "Comeback"))
+            # Check for both Tour and Comeback; map() keeps results in job order
+            jobs = [(artist, query_type) for artist in artists for query_type in ("US Tour", "Comeback")]
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                for news in executor.map(lambda job: self.fetch_news(*job), jobs):
+                    all_news.extend(news)
+            self.save_feed_cache()
                 
             clean_news = self.deduplicate(all_news)
             
             # Enrich with images (Scrape OG tags for top items)
             # We only enrich the top N items per artist/category to save time
-            enriched_news = self.enrich_with_images(clean_news, limit_per_artist=3)
+            enriched_news = [item.to_dict() for item in self.enrich_with_images(clean_news, limit_per_artist=3)]
+            self.save_og_cache()
             
-            # Output JSON
-            with open("kpop_intelligence.json", "w") as f:
-                json.dump(enriched_news, f, indent=2)
+            # Output JSON, one record per line, each serialized straight into the write buffer
+            with open("kpop_intelligence.json", "wb") as f:
+                sep = b"[\n"
+                for record in enriched_news:
+                    f.write(sep)
+                    f.write(orjson.dumps(record))
+                    sep = b",\n"
+                f.write(b"\n]\n" if enriched_news else b"[]\n")
             
             # Output Markdown Summary
             self.generate_markdown(enriched_news)
         
         # Output HTML Web Report
-        self.generate_html(enriched_news, targets)
+        self.generate_html(enriched_news, categories)
         
         logger.info(f"Scan complete. Processing {len(enriched_news)} items.")
 
     def generate_markdown(self, items: List[Dict]):
-        md_lines = ["# K-pop Intelligence Report", f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}", ""]
-        
-        if not items:
-            md_lines.append("_No high-priority intelligence found in this scan._")
-        else:
-            md_lines.append("| Artist | Topic | Source | Title | Cities/Dates |")
-            md_lines.append("|---|---|---|---|---|")
+        # Rows go straight into the file's write buffer; no intermediate document string
+        with open("summary.md", "w", encoding="utf-8") as f:
+            w = f.write
+            w("# K-pop Intelligence Report\n")
+            w(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
             
-            for item in items:
-                meta = []
-                if item['extracted_cities']:
-                    meta.append(f"🏙️ {', '.join(item['extracted_cities'])}")
-                if item['extracted_dates']:
-                    meta.append(f"📅 {', '.join(item['extracted_dates'])}")
-                
-                meta_str = "<br>".join(meta) if meta else "-"
-                
-                row = f"| **{item['artist']}** | {item['topic']} | *{item['source']}* | [{item['title']}]({item['url']}) | {meta_str} |"
-                md_lines.append(row)
+            if not items:
+                w("\n_No high-priority intelligence found in this scan._")
+            else:
+                w("\n| Artist | Topic | Source | Title | Cities/Dates |")
+                w("\n|---|---|---|---|---|")
                 
-        with open("summary.md", "w") as f:
-            f.write("\n".join(md_lines))
-
-    def generate_html(self, items: List[Dict], categories: Dict[str, str]):
-        # Static Profile Images
-        PROFILE_IMAGES = {
-            "BTS": "https://upload.wikimedia.org/wikipedia/commons/thumb/6/65/BTS_logo_%282017%29.png/600px-BTS_logo_%282017%29.png",
-            "BLACKPINK": "https://upload.wikimedia.org/wikipedia/commons/2/29/Blackpink_logo.svg",
-            "SEVENTEEN": "https://upload.wikimedia.org/wikipedia/commons/thumb/f/f6/Seventeen_Logo.jpg/640px-Seventeen_Logo.jpg",
-            "NewJeans": "https://upload.wikimedia.org/wikipedia/commons/thumb/1/1b/NewJeans_Logo.svg/1200px-NewJeans_Logo.svg.png",
-            "ENHYPEN": "https://upload.wikimedia.org/wikipedia/commons/thumb/6/6b/Enhypen_logo.svg/1200px-Enhypen_logo.svg.png",
-            "ITZY": "https://upload.wikimedia.org/wikipedia/commons/thumb/b/b3/Itzy_logo.svg/1200px-Itzy_logo.svg.png",
-            "NCT DREAM": "https://upload.wikimedia.org/wikipedia/commons/thumb/3/30/NCT_Dream_logo.svg/1200px-NCT_Dream_logo.svg.png",
-            "TWICE": "https://upload.wikimedia.org/wikipedia/commons/thumb/f/f3/Twice_Logo.png/640px-Twice_Logo.png",
-            "Stray Kids": "https://upload.wikimedia.org/wikipedia/commons/thumb/f/f1/Stray_Kids_Logo.svg/1200px-Stray_Kids_Logo.svg.png",
-            "aespa": "https://upload.wikimedia.org/wikipedia/commons/thumb/2/23/Aespa_Logo.svg/1200px-Aespa_Logo.svg.png",
-            "IVE": "https://upload.wikimedia.org/wikipedia/commons/thumb/c/c9/Ive_Logo.svg/1200px-Ive_Logo.svg.png",
-            "LE SSERAFIM": "https://upload.wikimedia.org/wikipedia/commons/thumb/e/e0/Le_Sserafim_Logo.svg/1200px-Le_Sserafim_Logo.svg.png",
-            "BABYMONSTER": "https://upload.wikimedia.org/wikipedia/commons/thumb/a/a2/Babymonster_Logo.svg/1200px-Babymonster_Logo.svg.png",
-            "ATEEZ": "https://upload.wikimedia.org/wikipedia/commons/thumb/1/14/Ateez_logo.png/640px-Ateez_logo.png",
-            "NCT WISH": "https://upload.wikimedia.org/wikipedia/commons/thumb/0/07/NCT_Wish_Logo.svg/1200px-NCT_Wish_Logo.svg.png",
-            "TWS": "https://upload.wikimedia.org/wikipedia/commons/thumb/5/52/TWS_Logo.svg/1200px-TWS_Logo.svg.png",
-            "KISS OF LIFE": "https://upload.wikimedia.org/wikipedia/commons/thumb/3/3d/Kiss_of_Life_Logo.svg/1200px-Kiss_of_Life_Logo.svg.png",
-            "BIBI": "https://i.scdn.co/image/ab6761610000e5eb989ed05e1f059c60d5b6de3d",
-            "XG": "https://upload.wikimedia.org/wikipedia/commons/thumb/0/0d/XG_Logo.svg/1200px-XG_Logo.svg.png",
-            "NMIXX": "https://upload.wikimedia.org/wikipedia/commons/thumb/e/ee/Nmixx_Logo.svg/1200px-Nmixx_Logo.svg.png",
-            "Cortis": "",
-            "All Day Project": ""
-        }
+                for item in items:
+                    meta = []
+                    if item['extracted_cities']:
+                        meta.append(f"🏙️ {', '.join(item['extracted_cities'])}")
+                    if item['extracted_dates']:
+                        meta.append(f"📅 {', '.join(item['extracted_dates'])}")
+                    
+                    w("\n")
+                    cells = {key: item[key].translate(_MD_ESC) for key in _MD_TEXT_FIELDS}
+                    cells["url"] = item["url"].translate(_MD_URL_ESC)
+                    w(_MD_ROW.format(cells, "<br>".join(meta) if meta else "-"))
 
+    def generate_html(self, items: List[Dict], categories: Dict[str, Category]):
         # Prepare Data for Frontend
         artist_data = {}
-        processed_artists = set()
+        sorted_artists = []  # dropdown order, kept sorted as artists first appear
 
         # ---------------------------------------------------------
         # REAL-TIME PRICE CHECK (BIG DATA)
@@ -443,37 +881,29 @@ class KpopIntelligenceBot:
         
         for item in items:
             name = item['artist']
-            processed_artists.add(name)
             if name not in artist_data:
-                artist_data[name] = {"tour": [], "comeback": [], "avatar": "", "category": categories.get(name, "Unknown")}
+                category = categories.get(name)
+                artist_data[name] = {"tour": [], "comeback": [], "avatar": "", "category": category.label if category is not None else "Unknown"}
+                insort(sorted_artists, name)
             
             key = "tour" if "Tour" in item['topic'] else "comeback"
-            artist_data[name][key].append(item)
+            # Badge flag decided once here, so the page never scans titles while rendering
+            is_local = bool(_LOCAL_TITLE_RE.search(item['title'])) or \
+                any(city.lower() in LOCAL_CITIES for city in item['extracted_cities'])
+            artist_data[name][key].append({**item, "is_local": is_local})
 
         # Avatar Resolution
         for name, data in artist_data.items():
-            avatar = ""
-            # Priority 1: Comeback News Image
-            for item in data['comeback']:
-                if item.get("image_url"):
-                    avatar = item["image_url"]
-                    break
-            # Priority 2: Tour News Image
-            if not avatar:
-                for item in data['tour']:
-                    if item.get("image_url"):
-                        avatar = item["image_url"]
-                        break
-            # Priority 3: Static Profile
-            if not avatar:
-                avatar = PROFILE_IMAGES.get(name, "")
-            
-            # Priority 4: UI Avatar
-            if not avatar:
-                safe_name = requests.utils.quote(name)
-                avatar = f"https://ui-avatars.com/api/?name={safe_name}&background=random&color=fff&size=200"
+            # Priority: comeback news image, tour news image, static profile, UI avatar
+            avatar = (
+                next((item["image_url"] for item in data['comeback'] if item.get("image_url")), "")
+                or next((item["image_url"] for item in data['tour'] if item.get("image_url")), "")
+                or PROFILE_IMAGES.get(name, "")
+                or _UI_AVATAR_URL.format(quote(name))
+            )
             
-            artist_data[name]["avatar"] = avatar
+            # The hero card drops this into an src attribute via innerHTML; feed URLs are untrusted
+            artist_data[name]["avatar"] = avatar.translate(_HTML_ESC)
             
             # ---------------------------------------------------------
             # 一丹的时尚雷达 (YIDAN'S FASHION RADAR)
@@ -532,12 +962,12 @@ class KpopIntelligenceBot:
             for c in closet:
                 # Premium placeholder images - use item_en or fallback to item
                 item_name = c.get('item_en') or c.get('item', 'fashion')
-                c["img"] = f"https://api.dicebear.com/7.x/shapes/svg?seed={requests.utils.quote(item_name) + name}&backgroundColor=FFD1DC"
+                c["img"] = f"https://api.dicebear.com/7.x/shapes/svg?seed={quote(item_name) + name}&backgroundColor=FFD1DC"
                 # Deep-search URLs with artist + style
                 search_term = f"{name} {c['search']}"
-                c["wconcept"] = f"https://us.wconcept.com/catalogsearch/result/?q={requests.utils.quote(search_term)}"
-                c["musinsa"] = f"https://global.musinsa.com/main/search?q={requests.utils.quote(search_term)}"
-                c["lewkin"] = f"https://lewkin.com/search?q={requests.utils.quote(search_term)}"
+                c["wconcept"] = f"https://us.wconcept.com/catalogsearch/result/?q={quote(search_term)}"
+                c["musinsa"] = f"https://global.musinsa.com/main/search?q={quote(search_term)}"
+                c["lewkin"] = f"https://lewkin.com/search?q={quote(search_term)}"
             
             artist_data[name]["closet"] = closet
             
@@ -587,11 +1017,25 @@ class KpopIntelligenceBot:
                 }
             
             artist_data[name]["fashion_analysis"] = fashion_analysis
-        
-        # Sort for dropdown
-        sorted_artists = sorted(list(processed_artists))
 
-        html_template = """
+        # orjson emits compact UTF-8 bytes directly; the payloads are read by the browser, not by people.
+        # Every "<" becomes \u003c (same string once parsed), so a scraped title can neither close
+        # the surrounding <script> ("</script>") nor switch the tokenizer into its "<!--" escaped state.
+        payloads = {
+            "kpop_json": orjson.dumps(artist_data).replace(b"<", b"\\u003c"),
+            "artists_json": orjson.dumps(sorted_artists).replace(b"<", b"\\u003c"),
+            "bts_tour_injection": bts_tour_injection.encode("utf-8"),
+            "nmixx_tour_injection": nmixx_tour_injection.encode("utf-8")
+        }
+        
+        # Pre-encoded template chunks sit at even indexes, placeholder names at odd ones.
+        # writelines() streams chunks and payloads in order, so no joined copy of the page is built.
+        with open("report.html", "wb") as f:
+            f.writelines(payloads[chunk] if i % 2 else chunk for i, chunk in enumerate(_REPORT_CHUNKS))
+
+# report.html template. Minified and split once at import around its {placeholder} slots, so
+# generate_html streams the static (pre-encoded) chunks and the payloads in one pass.
+REPORT_TEMPLATE = """
 <!DOCTYPE html>
 <html lang="zh-CN">
 <head>
@@ -808,6 +1252,12 @@ class KpopIntelligenceBot:
             box-shadow: 0 0 20px var(--pink);
         }
 
+        /* Every tab is rendered once per artist; #tab-content[data-active] picks the visible pane */
+        .tab-pane { display: none; }
+        #tab-content[data-active="tour"] > [data-tab="tour"],
+        #tab-content[data-active="comeback"] > [data-tab="comeback"],
+        #tab-content[data-active="closet"] > [data-tab="closet"] { display: block; }
+
         /* NEWS LIST */
         .news-grid {
             display: flex;
@@ -846,7 +1296,8 @@ class KpopIntelligenceBot:
             border-radius: 12px;
             object-fit: cover;
             flex-shrink: 0;
-            background: #171717;
+            /* Shown until the lazy image arrives, and kept if it never does */
+            background: #171717 url("data:image/svg+xml,%3Csvg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 24 24'%3E%3Cpath fill='%23555' d='M12 3v10.55A4 4 0 1 0 14 17V7h4V3z'/%3E%3C/svg%3E") center / 40% no-repeat;
         }
 
         .news-info {
@@ -1115,8 +1566,25 @@ class KpopIntelligenceBot:
         <div id="hero-card"></div>
     </div>
 
+    <!-- One news row; cloned per item and filled through textContent -->
+    <template id="news-item-tpl">
+        <a target="_blank" class="news-item">
+            <img class="news-thumb" alt="" loading="lazy" decoding="async">
+            <div class="news-info">
+                <div class="news-title"></div>
+                <div class="news-meta">
+                    <span class="news-source"></span>
+                    <span>•</span>
+                    <span class="news-date"></span>
+                </div>
+            </div>
+        </a>
+    </template>
+
+    <script id="kpop-data" type="application/json">{kpop_json}</script>
     <script>
-        const KPOP_DATA = {kpop_json};
+        // JSON.parse on the data island beats tokenizing the same payload as a JS literal
+        const KPOP_DATA = JSON.parse(document.getElementById('kpop-data').textContent);
         const SORTED_ARTISTS = {artists_json};
         
         // ---------------------------------------------------------
@@ -1132,11 +1600,23 @@ class KpopIntelligenceBot:
         // ---------------------------------------------------------
         {nmixx_tour_injection}
 
+        // Data is read-only past the injections above: freezing it pins each object's shape
+        function deepFreeze(o) {
+            if(o && typeof o === 'object') {
+                Object.freeze(o);
+                for(const k in o) deepFreeze(o[k]);
+            }
+            return o;
+        }
+        deepFreeze(KPOP_DATA);
+
         const heroCard = document.getElementById('hero-card');
 
         // STATE
         let currentTab = 'tour';
         let currentArtist = '';
+        let tabContent = null;   // #tab-content of the current hero card
+        let tabButtons = [];     // its .tab-btn elements, looked up once per render
 
         function init() {
             // Populate Dropdowns
@@ -1207,39 +1687,43 @@ class KpopIntelligenceBot:
                     
                     <div class="hero-content">
                         <div class="tabs">
-                            <button class="tab-btn ${currentTab === 'tour' ? 'active' : ''}" onclick="switchTab('tour')">
+                            <button class="tab-btn ${currentTab === 'tour' ? 'active' : ''}" data-tab="tour" onclick="switchTab('tour')">
                                 <div>Live Tour</div>
                                 <div style="font-size:0.85rem; opacity:0.8; margin-top:4px;">巡演</div>
                             </button>
-                            <button class="tab-btn ${currentTab === 'comeback' ? 'active' : ''}" onclick="switchTab('comeback')">
+                            <button class="tab-btn ${currentTab === 'comeback' ? 'active' : ''}" data-tab="comeback" onclick="switchTab('comeback')">
                                 <div>New Comeback Stage</div>
                                 <div style="font-size:0.85rem; opacity:0.8; margin-top:4px;">新歌和舞台</div>
                             </button>
-                            <button class="tab-btn ${currentTab === 'closet' ? 'active' : ''}" onclick="switchTab('closet')">
+                            <button class="tab-btn ${currentTab === 'closet' ? 'active' : ''}" data-tab="closet" onclick="switchTab('closet')">
                                 <div>Idol Closet & 一丹的时尚雷达 ✨</div>
                                 <div style="font-size:0.85rem; opacity:0.8; margin-top:4px;">偶像衣橱 & 时尚简评</div>
                             </button>
                         </div>
-                        <div id="tab-content">
-                            ${renderTabContent(data, currentTab)}
+                        <div id="tab-content" data-active="${currentTab}">
+                            <div class="tab-pane" data-tab="tour">${renderTabContent(data, 'tour')}</div>
+                            <div class="tab-pane" data-tab="comeback">${renderTabContent(data, 'comeback')}</div>
+                            <div class="tab-pane" data-tab="closet">${renderTabContent(data, 'closet')}</div>
                         </div>
                     </div>
                 `;
                 heroCard.innerHTML = html;
+                tabContent = heroCard.querySelector('#tab-content');
+                tabButtons = Array.from(heroCard.querySelectorAll('.tab-btn'));
+                heroCard.querySelectorAll('.news-grid[data-news]').forEach(grid => {
+                    grid.replaceChildren(buildNewsGrid(newsItemsFor(data, grid.dataset.news), grid.dataset.news));
+                });
                 heroCard.classList.add('visible');
             }, 200);
         }
 
         window.switchTab = function(tab) {
+            // Panes were all rendered by renderArtist: flip one attribute, no re-render
             currentTab = tab;
-            document.querySelectorAll('.tab-btn').forEach(b => {
-                const t = b.innerText.toLowerCase();
-                if(tab === 'tour') b.classList.toggle('active', t.includes('tour'));
-                else if(tab === 'comeback') b.classList.toggle('active', t.includes('music'));
-                else if(tab === 'closet') b.classList.toggle('active', t.includes('closet'));
-            });
-            const data = KPOP_DATA[currentArtist];
-            document.getElementById('tab-content').innerHTML = renderTabContent(data, tab);
+            tabContent.dataset.active = tab;
+            for(let i = 0; i < tabButtons.length; i++) {
+                tabButtons[i].classList.toggle('active', tabButtons[i].dataset.tab === tab);
+            }
         }
 
         // HELPER: Dynamic Link Generator (Cheapest Platform Logic)
@@ -1290,16 +1774,76 @@ class KpopIntelligenceBot:
             return uniqueCities.slice(0, 4);
         }
 
-        function renderTabContent(data, tab) {
-            const today = new Date();
+        // Date formatters built once: each toLocale*String() call sets up a fresh Intl formatter
+        const DATE_FMT = new Intl.DateTimeFormat();
+        const MONTH_FMT = new Intl.DateTimeFormat('en-US', {month:'short'});
 
+        function formatDate(value) {
+            const d = new Date(value);
+            return isNaN(d) ? 'Invalid Date' : DATE_FMT.format(d);
+        }
+
+        // Location badge, cloned into rows flagged is_local by the report builder
+        const LOCAL_BADGE = document.createElement('span');
+        LOCAL_BADGE.className = 'local-badge';
+        LOCAL_BADGE.textContent = '📍 SEATTLE';
+
+        // Empty-state copy per news tab
+        const EMPTY_COPY = Object.freeze({
+            tour: 'No confirmed dates found.',
+            comeback: 'No new music released in the last 6 months.'
+        });
+
+        // Filter: comeback only shows releases from the last 6 months
+        function newsItemsFor(data, tab) {
+            const items = data[tab] || [];
+            if(tab !== 'comeback') return items;
+            const sixMonthsAgo = new Date();
+            sixMonthsAgo.setMonth(sixMonthsAgo.getMonth() - 6);
+            return items.filter(item => new Date(item.published_at) > sixMonthsAgo);
+        }
+
+        // Clone the parsed row template per item instead of re-parsing an HTML string;
+        // scraped titles go in as text, never as markup
+        const NEWS_TPL = document.getElementById('news-item-tpl').content.firstElementChild;
+
+        function buildNewsGrid(items, tab) {
+            const frag = document.createDocumentFragment();
+            for (let i = 0; i < items.length; i++) {
+                const item = items[i];
+                const node = NEWS_TPL.cloneNode(true);
+                node.href = item.url;
+                if(item.image_url) node.querySelector('.news-thumb').src = item.image_url;
+                
+                // Location Badge
+                const title = node.querySelector('.news-title');
+                if(item.is_local) title.appendChild(LOCAL_BADGE.cloneNode(true));
+                title.append(item.title);
+                node.querySelector('.news-source').textContent = item.source;
+                node.querySelector('.news-date').textContent = formatDate(item.published_at);
+                
+                // Official MV Search Link (comeback tab only)
+                if(tab === 'comeback') {
+                    const yt = document.createElement('a');
+                    yt.href = `https://www.youtube.com/results?search_query=${encodeURIComponent(currentArtist + ' ' + item.title + ' Official MV')}`;
+                    yt.target = '_blank';
+                    yt.className = 'btn-yt';
+                    yt.textContent = '▶ Watch Official MV';
+                    node.querySelector('.news-info').appendChild(yt);
+                }
+                frag.appendChild(node);
+            }
+            return frag;
+        }
+
+        function renderTabContent(data, tab) {
             // 1. TOUR INTELLIGENCE
             if(tab === 'tour' && data.tour && data.tour[0]?.prices) {
                 const recs = getProfessionalSort(data.tour);
                 
                 const rows = recs.map((t, index) => {
                     const dateObj = new Date(t.date + 'T00:00:00');
-                    const month = dateObj.toLocaleString('en-US', {month:'short'});
+                    const month = MONTH_FMT.format(dateObj);
                     const day = dateObj.getDate();
                     
                     // Sort prices to find best deal
@@ -1365,14 +1909,7 @@ class KpopIntelligenceBot:
             } 
             
             // 2. NEW MUSIC LOGIC
-            // Filter: Released < 6 months ago
-            let items = data[tab] || [];
-            if(tab === 'comeback') {
-                const sixMonthsAgo = new Date();
-                sixMonthsAgo.setMonth(today.getMonth() - 6);
-                
-                items = items.filter(item => new Date(item.published_at) > sixMonthsAgo);
-            }
+            const items = newsItemsFor(data, tab);
             
              // 3. 一丹的时尚雷达 (FASHION RADAR LOGIC)
             if(tab === 'closet') {
@@ -1446,7 +1983,7 @@ class KpopIntelligenceBot:
                      return `
                      <div class="ticket-row" style="display:flex; flex-direction:column; padding:0; height:auto; border:none; background:rgba(255,255,255,0.3); overflow:hidden; border-radius:16px; position:relative;">
                          <div style="height:180px; width:100%; background:#FFD1DC; display:flex; align-items:center; justify-content:center; position:relative;">
-                             <img src="${item.img}" style="width:80%; height:80%; object-fit:contain;">
+                             <img src="${item.img}" loading="lazy" decoding="async" style="width:80%; height:80%; object-fit:contain;">
                              <div style="position:absolute; top:12px; left:12px; background:rgba(26,10,30,0.85); color:#fff; padding:6px 12px; border-radius:20px; font-size:0.7rem; font-weight:600; backdrop-filter:blur(8px);">
                                  ${item.style_analysis}
                              </div>
@@ -1485,35 +2022,12 @@ class KpopIntelligenceBot:
             
             if(items.length === 0) {
                 return `<div class="fallback-box">
-                    ${tab === 'tour' ? 'No confirmed dates found.' : 'No new music released in the last 6 months.'}
+                    ${EMPTY_COPY[tab]}
                 </div>`;
             }
 
-            return `<div class="news-grid">` + items.map(item => {
-                // Official MV Search Link
-                const ytLink = `https://www.youtube.com/results?search_query=${encodeURIComponent(currentArtist + ' ' + item.title + ' Official MV')}`;
-                // Location Badge
-                const hasSeattle = (item.title + (item.extracted_cities||[]).join('')).includes('Seattle');
-                const badge = hasSeattle ? `<span class="local-badge">📍 SEATTLE</span>` : '';
-                
-                const actionBtn = tab === 'comeback' ? 
-                    `<a href="${ytLink}" target="_blank" class="btn-yt">▶ Watch Official MV</a>` : '';
-
-                return `
-                    <a href="${item.url}" target="_blank" class="news-item">
-                        <img src="${item.image_url || ''}" class="news-thumb" onerror="this.style.display='none'">
-                        <div class="news-info">
-                            <div class="news-title">${badge}${item.title}</div>
-                            <div class="news-meta">
-                                <span>${item.source}</span>
-                                <span>•</span>
-                                <span>${new Date(item.published_at).toLocaleDateString()}</span>
-                            </div>
-                            ${actionBtn}
-                        </div>
-                    </a>
-                `;
-            }).join('') + `</div>`;
+            // Empty shell: renderArtist fills it with cloned nodes (buildNewsGrid)
+            return `<div class="news-grid" data-news="${tab}"></div>`;
         }
 
         init();
@@ -1521,37 +2035,40 @@ class KpopIntelligenceBot:
 </body>
 </html>
 """
-        final_html = html_template.replace("{kpop_json}", json.dumps(artist_data)) \
-                                  .replace("{artists_json}", json.dumps(sorted_artists)) \
-                                  .replace("{bts_tour_injection}", bts_tour_injection) \
-                                  .replace("{nmixx_tour_injection}", nmixx_tour_injection)
-        
-        with open("report.html", "w") as f:
-            f.write(final_html)
+def _minify_template(text: str) -> str:
+    """Build-time minification: drop indentation and blank lines, keep line breaks.
+
+    Keeping every line break leaves JS automatic semicolon insertion untouched, and the
+    only multi-line strings in the template are HTML template literals, where collapsed
+    indentation renders the same.
+    """
+    return "\n".join(line.strip() for line in text.splitlines() if line.strip())
+
+_REPORT_CHUNKS = [
+    chunk if i % 2 else chunk.encode("utf-8")
+    for i, chunk in enumerate(re.split(
+        r"\{(kpop_json|artists_json|bts_tour_injection|nmixx_tour_injection)\}",
+        _minify_template(REPORT_TEMPLATE)
+    ))
+]
 
 if __name__ == "__main__":
+    _install_dns_cache()
     bot = KpopIntelligenceBot()
     
     # Categorized Targets
     targets = {
-        # Boy Groups
-        "BTS": "Boy Group", "ENHYPEN": "Boy Group", "SEVENTEEN": "Boy Group",
-        "NCT DREAM": "Boy Group", "TWS": "Boy Group", "NCT WISH": "Boy Group",
-        "Cortis": "Boy Group", "Stray Kids": "Boy Group", "ATEEZ": "Boy Group",
-        
-        # Girl Groups
-        "BLACKPINK": "Girl Group", "ITZY": "Girl Group", "NewJeans": "Girl Group",
-        "aespa": "Girl Group", "KISS OF LIFE": "Girl Group", "XG": "Girl Group",
-        "TWICE": "Girl Group", "LE SSERAFIM": "Girl Group", "SAY MY NAME": "Girl Group",
-        "NMIXX": "Girl Group",
-        "izna": "Girl Group", "MEOVV": "Girl Group", "IVE": "Girl Group",
-        "BABYMONSTER": "Girl Group",
-        
-        # Soloists
-        "BIBI": "Soloist", 
-        
-        # Co-ed
-        "All Day Project": "Co-ed Group"
+        Category.BOY_GROUP: (
+            "BTS", "ENHYPEN", "SEVENTEEN", "NCT DREAM", "TWS", "NCT WISH",
+            "Cortis", "Stray Kids", "ATEEZ"
+        ),
+        Category.GIRL_GROUP: (
+            "BLACKPINK", "ITZY", "NewJeans", "aespa", "KISS OF LIFE", "XG",
+            "TWICE", "LE SSERAFIM", "SAY MY NAME", "NMIXX",
+            "izna", "MEOVV", "IVE", "BABYMONSTER"
+        ),
+        Category.SOLOIST: ("BIBI",),
+        Category.COED: ("All Day Project",)
     }
 
     bot.run(targets)
@@ -0,0 +1,158 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+import requests
+
+import kpop_bot
+from kpop_bot import KpopIntelligenceBot, NewsItem
+
+
+def _item(title, source="Soompi", artist="BTS", cities=()):
+    return NewsItem.from_dict({
+        "artist": artist,
+        "topic": "US Tour",
+        "title": title,
+        "source": source,
+        "url": "https://news.google.com/rss/articles/x",
+        "published_at": "",
+        "image_url": "",
+        "extracted_cities": list(cities),
+        "extracted_dates": [],
+    })
+
+
+class NewsItemTest(unittest.TestCase):
+    def test_to_dict_round_trips_without_the_dedup_key(self):
+        item = _item("BTS announce 2026 world tour - Soompi", cities=["Seattle"])
+        record = item.to_dict()
+        self.assertNotIn("key", record)
+        self.assertEqual(NewsItem.from_dict(record), item)
+
+
+class ExtractMetadataTest(unittest.TestCase):
+    def test_date_with_non_breaking_space(self):
+        metadata = KpopIntelligenceBot().extract_metadata("BTS tour begins March\xa015, 2026 in Seattle")
+        self.assertEqual(metadata, {"cities": ["Seattle"], "dates": ["March\xa015, 2026"]})
+
+
+class DeduplicateTest(unittest.TestCase):
+    def setUp(self):
+        self.bot = KpopIntelligenceBot()
+
+    def titles(self, items):
+        return [item.title for item in self.bot.deduplicate(items)]
+
+    def test_distinct_non_latin_titles_are_kept(self):
+        items = [
+            _item("방탄소년단 월드투어 서울 공연 확정"),
+            _item("블랙핑크 신곡 뮤직비디오 공개"),
+        ]
+        self.assertEqual(self.titles(items), [item.title for item in items])
+
+    def test_non_latin_reprint_is_dropped(self):
+        items = [
+            _item("방탄소년단 월드투어 서울 공연 확정 - Soompi"),
+            _item("방탄소년단 월드투어 서울 공연 확정!", source="allkpop"),
+        ]
+        self.assertEqual(self.titles(items), [items[0].title])
+
+    def test_wordless_titles_are_not_fuzzy_merged(self):
+        items = [_item("🔥🔥🔥"), _item("💜💜")]
+        self.assertEqual(self.titles(items), [item.title for item in items])
+
+    def _tour_item(self, title):
+        cities = self.bot.extract_metadata(title)["cities"]
+        return _item(title, cities=cities)
+
+    def test_different_tour_years_are_kept(self):
+        items = [
+            self._tour_item("BTS announce 2025 world tour dates"),
+            self._tour_item("BTS announce 2026 world tour dates"),
+        ]
+        self.assertEqual(self.titles(items), [item.title for item in items])
+
+    def test_different_day_numbers_are_kept(self):
+        items = [
+            self._tour_item("BTS Seattle concert Day 1 recap"),
+            self._tour_item("BTS Seattle concert Day 2 recap"),
+        ]
+        self.assertEqual(self.titles(items), [item.title for item in items])
+
+    def test_different_cities_are_kept(self):
+        items = [
+            self._tour_item("BTS adds LA date to world tour"),
+            self._tour_item("BTS adds NY date to world tour"),
+            self._tour_item("BTS adds Chicago date to world tour"),
+            self._tour_item("BTS adds Houston date to world tour"),
+        ]
+        self.assertEqual(self.titles(items), [item.title for item in items])
+
+    def test_typo_reprint_is_still_dropped(self):
+        items = [
+            self._tour_item("BTS announce 2026 world tour dates including Seattle"),
+            self._tour_item("BTS anounce 2026 world tour date including Seattle"),
+        ]
+        self.assertEqual(self.titles(items), [items[0].title])
+
+
+class _StubSession:
+    """Stands in for the pooled session: every GET returns the given response."""
+
+    def __init__(self, response):
+        self.response = response
+
+    def get(self, url, **kwargs):
+        self.response.url = url
+        return self.response
+
+
+class FetchNewsTest(unittest.TestCase):
+    def test_error_response_is_closed(self):
+        response = requests.Response()
+        response.status_code = 503
+        response.raw = io.BytesIO(b"")
+        bot = KpopIntelligenceBot()
+        bot.feed_cache = {}
+        bot._local.session = _StubSession(response)
+
+        self.assertEqual(bot.fetch_news("BTS"), [])
+        self.assertTrue(response.raw.closed)
+
+    def test_empty_body_yields_no_items(self):
+        response = requests.Response()
+        response.status_code = 200
+        response.raw = io.BytesIO(b"")
+        bot = KpopIntelligenceBot()
+        bot.feed_cache = {}
+        bot._local.session = _StubSession(response)
+
+        self.assertEqual(bot.fetch_news("BTS"), [])
+
+
+class GenerateHtmlTest(unittest.TestCase):
+    def test_script_like_title_round_trips_through_data_island(self):
+        title = "BTS <!--<script> teaser </script> drops - Soompi"
+        record = _item(title).to_dict()
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                KpopIntelligenceBot().generate_html([record], {"BTS": kpop_bot.Category.BOY_GROUP})
+                with open("report.html", encoding="utf-8") as f:
+                    page = f.read()
+            finally:
+                os.chdir(cwd)
+
+        opening = '<script id="kpop-data" type="application/json">'
+        start = page.index(opening) + len(opening)
+        island = page[start:page.index("</script>", start)]
+        self.assertNotIn("<", island)
+        titles = [item["title"] for tab in ("tour", "comeback") for item in json.loads(island)["BTS"][tab]]
+        self.assertEqual(titles, [title])
+
+
+if __name__ == "__main__":
+    unittest.main()